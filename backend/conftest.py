@@ -0,0 +1,5 @@
+import os
+
+# clients are built at import time; placeholder keys let tests import the modules
+for key in ("GEMINI_API_KEY", "EXA_API_KEY", "TAVILY_API_KEY"):
+    os.environ.setdefault(key, "test")
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from datetime import datetime
+import asyncio
+import secrets
+from ..core.diagnostics import loop_monitor, sample_profile
+from ..tools.search import search_router
+from ..config import config
+
+_profile_lock = asyncio.Lock()
+
+
+# admin endpoints stay disabled unless ADMIN_TOKEN is set
+async def require_admin(authorization: str | None = Header(default=None)):
+    if not config.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    expected = f"Bearer {config.admin_token}".encode("utf-8")
+    if not secrets.compare_digest((authorization or "").encode("utf-8"), expected):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+
+@router.get("/loop")
+async def loop_endpoint():
+    return loop_monitor.stats()
+
+
+# per-provider latency, error rate and unique yield, overall ("*") and per category
+@router.get("/search")
+async def search_endpoint():
+    return search_router.snapshot()
+
+
+# samples the live process for a few seconds and downloads folded stacks
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile_endpoint(seconds: float = 10.0, interval_ms: int = 5):
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="Profile already running")
+    async with _profile_lock:
+        folded = await asyncio.to_thread(
+            sample_profile,
+            max(0.5, min(seconds, 60.0)),
+            max(1, min(interval_ms, 100)),
+        )
+    name = f"profile-{datetime.now():%Y%m%d-%H%M%S}.folded"
+    return PlainTextResponse(
+        folded, headers={"Content-Disposition": f'attachment; filename="{name}"'}
+    )
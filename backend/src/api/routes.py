@@ -1,17 +1,22 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, HttpUrl, Field
+from typing import List, Literal
 from ..schemas import (
     CompanyProfile,
     PersonProfile,
     NewsDigest,
+    ResearchResult,
     ImageResponse,
     ImageResult,
     ImageRequest,
+    PolicySnapshot,
 )
 from ..services.company_service import research_company
 from ..services.person_service import research_person
-from ..services.news_service import research_news
+from ..services.news_service import research_news, research_news_batch
+from ..services.research_service import research
 from ..services.images_service import gen_images, edit_image
+from ..services.policy_service import get_policy, get_policy_history
 
 router = APIRouter()
 
@@ -31,6 +36,20 @@ class NewsRequest(BaseModel):
     source: str | None = None
 
 
+class NewsBatchRequest(BaseModel):
+    topics: List[str] = Field(min_length=1, max_length=20)
+    mode: str | None = "briefing"
+    days: int | None = 7
+    source: str | None = None
+
+
+class ResearchRequest(BaseModel):
+    linkedin_url: HttpUrl | None = None
+    company: str | None = None
+    sections: List[Literal["person", "company", "news"]] = ["person", "company", "news"]
+    days: int | None = 7
+
+
 @router.post("/company", response_model=CompanyProfile)
 async def company_endpoint(req: CompanyRequest):
     try:
@@ -60,6 +79,38 @@ async def news_endpoint(req: NewsRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# several topics per Gemini call; falls back to per-topic calls on bad output
+@router.post("/news/batch", response_model=List[NewsDigest])
+async def news_batch_endpoint(req: NewsBatchRequest):
+    try:
+        return await research_news_batch(
+            topics=req.topics,
+            mode=req.mode or "briefing",
+            days=req.days or 7,
+            source=req.source,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# person, company and news off one shared retrieval pass
+@router.post("/research", response_model=ResearchResult)
+async def research_endpoint(req: ResearchRequest):
+    if not req.linkedin_url and not req.company:
+        raise HTTPException(
+            status_code=400, detail="Provide a linkedin_url and/or a company"
+        )
+    try:
+        return await research(
+            linkedin_url=str(req.linkedin_url) if req.linkedin_url else None,
+            company=req.company,
+            sections=req.sections,
+            days=req.days or 7,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/image", response_model=ImageResponse)
 async def image_endpoint(req: ImageRequest):
     try:
@@ -96,3 +147,17 @@ async def image_edit_endpoint(
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# served from the persisted snapshot; the background refresher keeps it current
+@router.get("/policy", response_model=PolicySnapshot)
+async def policy_endpoint():
+    snapshot = get_policy()
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="Policy snapshot not ready")
+    return snapshot
+
+
+@router.get("/policy/history")
+async def policy_history_endpoint(limit: int = 10):
+    return get_policy_history(limit=max(1, min(limit, 100)))
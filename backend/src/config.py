@@ -4,6 +4,11 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+# comma-separated list with blanks and padding dropped
+def _split_urls(value: str) -> list[str]:
+    return [u.strip() for u in value.split(",") if u.strip()]
+
+
 class Config:
     gemini_api_key = os.getenv("GEMINI_API_KEY")
     exa_api_key = os.getenv("EXA_API_KEY")
@@ -15,6 +20,32 @@ class Config:
     api_host = os.getenv("API_HOST", "0.0.0.0")
     api_port = int(os.getenv("API_PORT", "8000"))
     tavily_api_key = os.getenv("TAVILY_API_KEY")
+    search_adaptive_routing = (
+        os.getenv("SEARCH_ADAPTIVE_ROUTING", "true").lower() == "true"
+    )
+    search_explore_rate = float(os.getenv("SEARCH_EXPLORE_RATE", "0.1"))
+    search_route_min_samples = int(os.getenv("SEARCH_ROUTE_MIN_SAMPLES", "5"))
+    news_batch_token_budget = int(os.getenv("NEWS_BATCH_TOKEN_BUDGET", "12000"))
+    news_batch_max_topics = int(os.getenv("NEWS_BATCH_MAX_TOPICS", "5"))
+    admin_token = os.getenv("ADMIN_TOKEN")
+    loop_lag_threshold_ms = int(os.getenv("LOOP_LAG_THRESHOLD_MS", "200"))
+    loop_lag_interval_ms = int(os.getenv("LOOP_LAG_INTERVAL_MS", "100"))
+    policy_store_path = os.getenv("POLICY_STORE_PATH", "policy_store.json")
+    policy_refresh_minutes = int(os.getenv("POLICY_REFRESH_MINUTES", "360"))
+    policy_retry_seconds = int(os.getenv("POLICY_RETRY_SECONDS", "30"))
+    policy_history_limit = int(os.getenv("POLICY_HISTORY_LIMIT", "30"))
+    policy_sources_my = _split_urls(
+        os.getenv(
+            "POLICY_SOURCES_MY",
+            "https://www.seda.gov.my/reportal/nem/,https://www.tnb.com.my/residential/nem",
+        )
+    )
+    policy_sources_sg = _split_urls(
+        os.getenv(
+            "POLICY_SOURCES_SG",
+            "https://www.ema.gov.sg/consumer-information/electricity/solar,https://www.spgroup.com.sg/our-services/utilities/sell-solar-energy",
+        )
+    )
 
 
 config = Config()
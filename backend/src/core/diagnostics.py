@@ -0,0 +1,116 @@
+from collections import Counter
+from typing import Any, Dict, Optional
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from .logging import get_logger
+from ..config import config
+
+log = get_logger("diagnostics")
+
+
+# watches the event loop from two sides:
+# - an async heartbeat measures how late each tick wakes up (lag)
+# - a watchdog thread notices a stale heartbeat while the loop is still blocked
+#   and logs the loop thread's stack, i.e. whatever is holding it
+class LoopLagMonitor:
+    def __init__(self, threshold_ms: int = 200, interval_ms: int = 100):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.heartbeat = time.perf_counter()
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.stalls = 0
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._reported = False
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self.heartbeat = time.perf_counter()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._beat())
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _beat(self) -> None:
+        while True:
+            t0 = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - t0 - self.interval)
+            self.heartbeat = now
+            self._reported = False
+            self.last_lag_ms = round(lag * 1000, 1)
+            self.max_lag_ms = max(self.max_lag_ms, self.last_lag_ms)
+            if lag > self.threshold:
+                self.stalls += 1
+                log.warning("event loop lagged %.0fms", lag * 1000)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            stalled = time.perf_counter() - self.heartbeat - self.interval
+            if stalled <= self.threshold or self._reported:
+                continue
+            # one snapshot per stall; the next heartbeat re-arms it
+            self._reported = True
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<no frame>"
+            log.warning(
+                "event loop blocked for %.0fms, loop thread stack:\n%s",
+                stalled * 1000,
+                stack,
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "threshold_ms": round(self.threshold * 1000),
+            "last_lag_ms": self.last_lag_ms,
+            "max_lag_ms": self.max_lag_ms,
+            "stalls": self.stalls,
+        }
+
+
+loop_monitor = LoopLagMonitor(
+    threshold_ms=config.loop_lag_threshold_ms, interval_ms=config.loop_lag_interval_ms
+)
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+# time-boxed sampling profile of every thread in the process
+# returns folded stacks ("thread;outer;...;inner count"), ready for flamegraph tools
+# blocking: call through asyncio.to_thread so the event loop itself gets sampled
+def sample_profile(seconds: float, interval_ms: int = 5) -> str:
+    me = threading.get_ident()
+    interval = interval_ms / 1000
+    counts: Counter = Counter()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for tid, frame in sys._current_frames().items():
+            if tid == me:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(tid, str(tid)))
+            counts[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+    return "\n".join(f"{stack} {n}" for stack, n in counts.most_common()) + "\n"
@@ -0,0 +1,16 @@
+import logging
+
+_handler = logging.StreamHandler()
+_handler.setFormatter(
+    logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+)
+
+_root = logging.getLogger("phonebook")
+_root.setLevel(logging.INFO)
+_root.addHandler(_handler)
+_root.propagate = False
+
+
+# namespaced logger so our output shows up next to uvicorn's
+def get_logger(name: str) -> logging.Logger:
+    return _root.getChild(name)
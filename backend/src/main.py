@@ -1,8 +1,30 @@
+import asyncio
+import contextlib
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .api.routes import router
+from .api.admin import router as admin_router
+from .core.diagnostics import loop_monitor
+from .services.policy_service import store as policy_store, policy_refresher
 
-app = FastAPI(title="Phonebook API")
+
+# start the event-loop lag monitor, load the persisted policy snapshot
+# and keep it fresh in the background
+@contextlib.asynccontextmanager
+async def lifespan(_: FastAPI):
+    loop_monitor.start()
+    policy_store.load()
+    refresher = asyncio.create_task(policy_refresher())
+    try:
+        yield
+    finally:
+        refresher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await refresher
+        await loop_monitor.stop()
+
+
+app = FastAPI(title="Phonebook API", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -15,6 +37,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.include_router(router)
+app.include_router(admin_router)
 
 
 @app.get("/health")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, HttpUrl, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -59,6 +59,19 @@ class PersonProfile(BaseModel):
     profile_completeness: float = Field(ge=0.0, le=1.0, default=0.7)
 
 
+# structured output from a linkedin profile page
+class LinkedinSchema(BaseModel):
+    name: str
+    company: str
+    role: str
+    location: str
+    bio: str
+    skills: List[str]
+    previous_companies: List[str]
+    conversation_starters: List[str]
+    discussion_topics: List[str]
+
+
 class NewsItem(BaseModel):
     title: str
     url: HttpUrl
@@ -81,6 +94,18 @@ class NewsDigest(BaseModel):
     citations: List[str] = Field(default_factory=list)
 
 
+class ResearchResult(BaseModel):
+    person: Optional[PersonProfile] = None
+    company: Optional[CompanyProfile] = None
+    news: Optional[NewsDigest] = None
+    queries: List[str] = Field(default_factory=list)
+    errors: Dict[str, str] = Field(default_factory=dict)
+
+
+class NewsDigestBatch(BaseModel):
+    digests: List[NewsDigest] = Field(default_factory=list)
+
+
 class ImageRequest(BaseModel):
     prompt: str
     n: int = Field(default=1, ge=1, le=4)
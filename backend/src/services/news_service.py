@@ -1,7 +1,10 @@
+from typing import List
+import asyncio
 from ..tools.news import news_search
-from ..tools.llm import summarize_news
+from ..tools.llm import summarize_news, summarize_news_batch
 from ..schemas import NewsDigest
 from ..core.workflow import run_steps
+from ..config import config
 
 
 # take a topic and return a news digest of the results
@@ -17,3 +20,33 @@ async def research_news(
 
     ctx = await run_steps([("search", step_search), ("summarize", step_summarize)])
     return ctx["summarize"]
+
+
+# digests for many topics: searches run concurrently, then topics are packed
+# into as few structured-output calls as the token budget allows
+async def research_news_batch(
+    topics: List[str],
+    mode: str = "briefing",
+    days: int = 7,
+    source: str | None = None,
+) -> List[NewsDigest]:
+    topics = list(dict.fromkeys(t.strip() for t in topics if t.strip()))
+
+    async def step_search(_):
+        return await asyncio.gather(
+            *(
+                news_search(topic=t, days=days, source=source, max_results=8)
+                for t in topics
+            )
+        )
+
+    async def step_summarize(ctx):
+        return await summarize_news_batch(
+            list(zip(topics, ctx["search"])),
+            mode=mode,
+            token_budget=config.news_batch_token_budget,
+            max_topics=config.news_batch_max_topics,
+        )
+
+    ctx = await run_steps([("search", step_search), ("summarize", step_summarize)])
+    return ctx["summarize"]
@@ -0,0 +1,219 @@
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import json
+import os
+from ..tools.policy import (
+    POLICY_SOURCES,
+    fetch_policy_pages,
+    hash_pages,
+    extract_policy,
+)
+from ..schemas import PolicySnapshot
+from ..core.workflow import run_steps
+from ..core.logging import get_logger
+from ..config import config
+
+log = get_logger("policy")
+
+
+# in-memory view of the persisted store; reads never leave this object
+class PolicyStore:
+    def __init__(self, path: str, history_limit: int):
+        self.path = path
+        self.history_limit = history_limit
+        self.snapshot: Optional[PolicySnapshot] = None
+        self.hashes: Dict[str, str] = {}
+        self.history: List[Dict[str, Any]] = []
+        # sections extracted while another section kept failing, with the hash
+        # they were extracted from; reused until the snapshot can be completed
+        self.pending: Dict[str, Tuple[Any, str]] = {}
+        # whether the last refresh fetched and extracted every section it needed
+        self.last_ok = False
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("snapshot"):
+                self.snapshot = PolicySnapshot.model_validate(data["snapshot"])
+            self.hashes = data.get("hashes", {})
+            self.history = data.get("history", [])
+        except Exception as e:
+            log.warning("could not load policy store %s: %s", self.path, e)
+
+    # atomic write so a crash mid-save never leaves a torn file
+    def save(self) -> None:
+        data = {
+            "snapshot": (
+                self.snapshot.model_dump(mode="json") if self.snapshot else None
+            ),
+            "hashes": self.hashes,
+            "history": self.history,
+        }
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def commit(
+        self, snapshot: PolicySnapshot, hashes: Dict[str, str], changed: List[str]
+    ) -> None:
+        prev = self.snapshot
+        self.snapshot = snapshot
+        self.hashes = hashes
+        self.history.insert(
+            0,
+            {
+                "updated_at": snapshot.updated_at.isoformat(),
+                "changed": changed,
+                "diff": diff_snapshots(prev, snapshot),
+                "snapshot": snapshot.model_dump(mode="json"),
+            },
+        )
+        del self.history[self.history_limit :]
+
+
+store = PolicyStore(config.policy_store_path, config.policy_history_limit)
+
+
+# flattens a dumped model into dotted paths for field-level diffs
+def _flatten(value: Any, prefix: str = "") -> Dict[str, Any]:
+    if isinstance(value, dict):
+        out: Dict[str, Any] = {}
+        for k, v in value.items():
+            out.update(_flatten(v, f"{prefix}.{k}" if prefix else k))
+        return out
+    return {prefix: value}
+
+
+# field-level changes between two snapshots (timestamps ignored)
+def diff_snapshots(
+    old: Optional[PolicySnapshot], new: PolicySnapshot
+) -> Dict[str, Dict[str, Any]]:
+    before = _flatten(old.model_dump(mode="json")) if old else {}
+    after = _flatten(new.model_dump(mode="json"))
+    return {
+        k: {"old": before.get(k), "new": after.get(k)}
+        for k in sorted(set(before) | set(after))
+        if k != "updated_at" and before.get(k) != after.get(k)
+    }
+
+
+def get_policy() -> Optional[PolicySnapshot]:
+    return store.snapshot
+
+
+def get_policy_history(limit: int = 10) -> List[Dict[str, Any]]:
+    return store.history[:limit]
+
+
+# fetch -> hash -> extract changed sections -> persist
+# sections whose source text is unchanged (or failed to fetch) keep their previous value
+async def refresh_policy() -> Optional[PolicySnapshot]:
+    sections = list(POLICY_SOURCES)
+
+    async def step_fetch(_):
+        pages = await asyncio.gather(
+            *(fetch_policy_pages(POLICY_SOURCES[s]) for s in sections)
+        )
+        return dict(zip(sections, pages))
+
+    async def step_hash(ctx):
+        return {s: hash_pages(p) for s, p in ctx["fetch"].items() if p}
+
+    async def step_extract(ctx):
+        out = {}
+        changed = []
+        for s, h in ctx["hash"].items():
+            if h == store.hashes.get(s) and store.snapshot is not None:
+                continue
+            if s in store.pending and store.pending[s][1] == h:
+                # extracted on an earlier attempt from the same text
+                out[s] = store.pending[s][0]
+                continue
+            changed.append(s)
+        parsed = await asyncio.gather(
+            *(extract_policy(s, ctx["fetch"][s]) for s in changed),
+            return_exceptions=True,
+        )
+        failed = [s for s in sections if s not in ctx["hash"]]
+        for s, p in zip(changed, parsed):
+            if isinstance(p, Exception):
+                log.warning("policy extraction failed for %s: %s", s, p)
+                failed.append(s)
+                continue
+            out[s] = p
+        return {"sections": out, "failed": failed}
+
+    async def step_persist(ctx):
+        extracted = ctx["extract"]["sections"]
+        store.last_ok = not ctx["extract"]["failed"]
+        if not extracted:
+            store.last_ok = store.last_ok and store.snapshot is not None
+            return store.snapshot
+        prev = store.snapshot
+        sections_now = {
+            s: extracted.get(s) or (getattr(prev, s) if prev else None)
+            for s in sections
+        }
+        # nothing to serve until every section has been extracted once;
+        # keep what did extract so the retry only pays for the rest
+        if any(v is None for v in sections_now.values()):
+            store.pending.update({s: (v, ctx["hash"][s]) for s, v in extracted.items()})
+            store.last_ok = False
+            return prev
+        store.pending.clear()
+        hashes = dict(store.hashes)
+        hashes.update({s: ctx["hash"][s] for s in extracted})
+        citations = sorted({p["url"] for s in sections for p in ctx["fetch"][s]})
+        if not citations and prev:
+            citations = prev.citations
+        snapshot = PolicySnapshot(**sections_now, citations=citations)
+        store.commit(snapshot, hashes, changed=sorted(extracted))
+        await asyncio.to_thread(store.save)
+        return snapshot
+
+    ctx = await run_steps(
+        [
+            ("fetch", step_fetch),
+            ("hash", step_hash),
+            ("extract", step_extract),
+            ("persist", step_persist),
+        ]
+    )
+    return ctx["persist"]
+
+
+# seconds until the next refresh: the full interval after a clean refresh,
+# otherwise exponential backoff from retry_seconds, capped at the interval
+def next_refresh_delay(failures: int, interval: float, retry_seconds: float) -> float:
+    if failures == 0:
+        return interval
+    return min(interval, retry_seconds * 2 ** (failures - 1))
+
+
+# background loop started from the app lifespan
+# retries sooner while there is no snapshot or the last refresh was incomplete
+async def policy_refresher(
+    interval_minutes: int = config.policy_refresh_minutes,
+    retry_seconds: int = config.policy_retry_seconds,
+):
+    failures = 0
+    while True:
+        try:
+            await refresh_policy()
+            ok = store.last_ok and store.snapshot is not None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning("policy refresh failed: %s", e)
+            ok = False
+        failures = 0 if ok else failures + 1
+        delay = next_refresh_delay(
+            failures, max(1, interval_minutes) * 60, max(1, retry_seconds)
+        )
+        if failures:
+            log.warning("policy refresh incomplete, retrying in %.0fs", delay)
+        await asyncio.sleep(delay)
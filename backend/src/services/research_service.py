@@ -0,0 +1,146 @@
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+from ..tools.linkedin import extract_linkedin_data
+from ..tools import search_web
+from ..tools.llm import analyze_content, summarize_news
+from ..schemas import CompanyProfile, PersonProfile, ResearchResult
+from ..core.workflow import run_steps
+
+SECTIONS = ("person", "company", "news")
+
+
+# one query set for every requested section; each query lists the sections it feeds
+# overlapping angles (person at company, company news) are asked once and shared
+def plan_queries(
+    person: str, company: str, sections: List[str], days: int = 7
+) -> List[Tuple[str, int, Tuple[str, ...]]]:
+    plan: List[Tuple[str, int, Tuple[str, ...]]] = []
+    if "person" in sections and person:
+        plan += [
+            (f"{person} {company}".strip(), 6, ("person", "company")),
+            (f"{person} articles posts speaking conferences", 5, ("person",)),
+            (f"{person} education work experience skills", 5, ("person",)),
+        ]
+    if "company" in sections and company:
+        plan += [
+            (f"{company} company overview products services", 6, ("company",)),
+            (f"{company} leadership team executives", 5, ("company", "person")),
+            (f"{company} funding revenue", 4, ("company",)),
+        ]
+    if ("news" in sections or "company" in sections) and company:
+        plan += [
+            (f"{company} news past {days} days", 5, ("news", "company")),
+            (f"latest updates {company}", 4, ("news", "company")),
+        ]
+    # dedupe on the token set so reordered duplicates collapse too
+    merged: Dict[frozenset, Tuple[str, int, Tuple[str, ...]]] = {}
+    for q, n, tags in plan:
+        key = frozenset(q.casefold().split())
+        if key in merged:
+            q0, n0, tags0 = merged[key]
+            merged[key] = (q0, max(n, n0), tuple(dict.fromkeys(tags0 + tags)))
+        else:
+            merged[key] = (q, n, tags)
+    return list(merged.values())
+
+
+# researches a person, their company and its news off one shared retrieval pass
+async def research(
+    linkedin_url: Optional[str] = None,
+    company: Optional[str] = None,
+    sections: Optional[List[str]] = None,
+    days: int = 7,
+) -> ResearchResult:
+    wanted = [s for s in (sections or SECTIONS) if s in SECTIONS]
+
+    # linkedin is only worth an Exa + Gemini call for the person or a missing company
+    async def step_extract(_):
+        if not linkedin_url or ("person" not in wanted and company):
+            return {}
+        return await extract_linkedin_data(linkedin_url)
+
+    # requested sections that can't be built are reported, not dropped silently
+    async def step_plan(ctx):
+        li = ctx["extract"]
+        person = li.get("name", "")
+        name = company or li.get("company", "")
+        skipped: Dict[str, str] = {}
+        if "person" in wanted:
+            if not linkedin_url:
+                skipped["person"] = "A linkedin_url is required for the person section"
+            elif li.get("error"):
+                skipped["person"] = li["error"]
+        for s in ("company", "news"):
+            if s in wanted and not name:
+                skipped[s] = "No company name given or found on the LinkedIn profile"
+        active = [s for s in wanted if s not in skipped]
+        return {
+            "person": person,
+            "company": name,
+            "active": active,
+            "skipped": skipped,
+            "queries": plan_queries(person, name, active, days=days),
+        }
+
+    async def step_search(ctx):
+        plan = ctx["plan"]["queries"]
+        results = await asyncio.gather(
+            *(search_web(q, max_results=n) for q, n, _ in plan)
+        )
+        evidence: Dict[str, List[Dict[str, Any]]] = {s: [] for s in SECTIONS}
+        seen: Dict[str, set] = {s: set() for s in SECTIONS}
+        for (_, _, tags), rows in zip(plan, results):
+            for r in rows:
+                u = r.get("url")
+                for s in tags:
+                    if u and u not in seen[s]:
+                        seen[s].add(u)
+                        evidence[s].append(r)
+        return evidence
+
+    async def step_analyze(ctx):
+        li = ctx["extract"]
+        person, name = ctx["plan"]["person"], ctx["plan"]["company"]
+        active = ctx["plan"]["active"]
+        evidence = ctx["search"]
+        jobs: Dict[str, Any] = {}
+        if "person" in active:
+            jobs["person"] = analyze_content(
+                content={"linkedin": li, "web": evidence["person"]},
+                target="person",
+                name=person or "Unknown",
+                schema=PersonProfile,
+            )
+        if "company" in active:
+            jobs["company"] = analyze_content(
+                content=evidence["company"],
+                target="company",
+                name=name,
+                schema=CompanyProfile,
+            )
+        if "news" in active:
+            jobs["news"] = summarize_news(
+                topic=name, mode="briefing", results=evidence["news"]
+            )
+        done = await asyncio.gather(*jobs.values(), return_exceptions=True)
+        return dict(zip(jobs, done))
+
+    ctx = await run_steps(
+        [
+            ("extract", step_extract),
+            ("plan", step_plan),
+            ("search", step_search),
+            ("analyze", step_analyze),
+        ]
+    )
+    out = ResearchResult(queries=[q for q, _, _ in ctx["plan"]["queries"]])
+    out.errors.update(ctx["plan"]["skipped"])
+    # a linkedin failure is already reported under person when it was requested
+    if ctx["extract"].get("error") and "person" not in out.errors:
+        out.errors["linkedin"] = ctx["extract"]["error"]
+    for s, v in ctx["analyze"].items():
+        if isinstance(v, Exception):
+            out.errors[s] = str(v)
+        else:
+            setattr(out, s, v)
+    return out
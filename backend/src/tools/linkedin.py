@@ -1,10 +1,10 @@
 # backend/src/tools/linkedin.py
-from typing import Dict, List, Any
+from typing import Dict, Any
 import re
 import asyncio
 from ..config import config
-from pydantic import BaseModel
-from .utils import clean_schema
+from ..schemas import LinkedinSchema
+from .prompts import REGISTRY
 from .clients import genai_client, exa_client
 
 
@@ -30,19 +30,7 @@ async def extract_linkedin_data(linkedin_url: str) -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"Exa fetch failed: {e}"}
 
-    # 2) structured output from the linkedin profile
-    class LinkedinSchema(BaseModel):
-        name: str
-        company: str
-        role: str
-        location: str
-        bio: str
-        skills: List[str]
-        previous_companies: List[str]
-        conversation_starters: List[str]
-        discussion_topics: List[str]
-
-    # 3) gemini prompt
+    # 2) gemini prompt
     prompt = (
         "Extract a concise LinkedIn profile from the following page content.\n"
         "Return JSON with EXACT keys:\n"
@@ -56,22 +44,21 @@ async def extract_linkedin_data(linkedin_url: str) -> Dict[str, Any]:
     )
 
     try:
-        json_schema = clean_schema(LinkedinSchema.model_json_schema())
         llm_resp = await asyncio.to_thread(
             genai_client.models.generate_content,
             model=config.gemini_model,
             contents=prompt,
             config={
                 "response_mime_type": "application/json",
-                "response_schema": json_schema,
+                "response_schema": REGISTRY["linkedin"].response_schema,
             },
         )
-        parsed: LinkedinSchema = LinkedinSchema.model_validate_json(llm_resp.text)
+        parsed: LinkedinSchema = REGISTRY["linkedin"].validate(llm_resp.text)
         out = parsed.model_dump()
     except Exception as e:
         return {"error": f"LLM extraction failed: {e}"}
 
-    # 4) add extra metadata
+    # 3) add extra metadata
     out["linkedin_url"] = canonical_url
     m = re.search(r"linkedin\.com/(?:in|pub)/([^/?#]+)", canonical_url)
     out["username"] = m.group(1) if m else ""
@@ -1,11 +1,14 @@
-from typing import Any, Type
+from typing import Any, List, Optional, Tuple, Type
 import asyncio
 from ..schemas import NewsDigest
-from .utils import clean_schema
+from .prompts import REGISTRY, compile_schema
 from .clients import genai_client
 from .formatting import format_results, format_content
+from ..core.logging import get_logger
 from ..config import config
 
+log = get_logger("llm")
+
 
 # analyzes raw content into a typed Pydantic schema via Gemini
 async def analyze_content(content: Any, target: str, name: str, schema: Type) -> Any:
@@ -14,30 +17,35 @@ async def analyze_content(content: Any, target: str, name: str, schema: Type) ->
         if target == "company"
         else "background, current role, work history, interests and posts, pain points, engagement opportunities"
     )
-    prompt = f"Analyze the information about {name} and return JSON matching the schema. Fill as much as possible; use sensible defaults if unknown.\nFocus: {focus}\nSchema:\n{schema.model_json_schema()}\n\nContent:\n{format_content(content)}"
+    compiled = compile_schema(schema)
+    prompt = f"Analyze the information about {name} and return JSON with these fields. Fill as much as possible; use sensible defaults if unknown.\nFocus: {focus}\nFields:\n{compiled.prompt_schema}\n\nContent:\n{format_content(content)}"
     resp = await asyncio.to_thread(
         genai_client.models.generate_content,
         model=config.gemini_model,
         contents=prompt,
         config={
             "response_mime_type": "application/json",
-            "response_schema": clean_schema(schema.model_json_schema()),
+            "response_schema": compiled.response_schema,
         },
     )
-    return schema.model_validate_json(resp.text)
+    return compiled.validate(resp.text)
+
+
+# news digest modes
+NEWS_MODES = {
+    "briefing": "Return a concise daily briefing: 4–6 sentences + compact bullets.",
+    "fun_fact": "Return 1–3 quirky facts with short context.",
+    "single_source": "Summarize from a single source if clearly present; otherwise a briefing.",
+}
+
+NEWS_RULES = "facts, dates, numbers; <=2 sentences per article; 3–5 key points; max 8 items; include citations."
 
 
 # turns a set of articles into a compact NewsDigest
 # three modes: briefing, fun_fact, single_source
 async def summarize_news(topic: str, mode: str, results: list) -> NewsDigest:
-    # modes
-    modes = {
-        "briefing": "Return a concise daily briefing: 4–6 sentences + compact bullets.",
-        "fun_fact": "Return 1–3 quirky facts with short context.",
-        "single_source": "Summarize from a single source if clearly present; otherwise a briefing.",
-    }
     # prompt
-    prompt = f"You are a precise news analyst.\nTopic: {topic}\nMode: {mode} -> {modes.get(mode, 'briefing')}\nRules: facts, dates, numbers; <=2 sentences per article; 3–5 key points; max 8 items; include citations.\n\nWeb results:\n{format_results(results)}"
+    prompt = f"You are a precise news analyst.\nTopic: {topic}\nMode: {mode} -> {NEWS_MODES.get(mode, 'briefing')}\nRules: {NEWS_RULES}\n\nWeb results:\n{format_results(results)}"
     # generate the content (structured output)
     # new digest needs: topic, mode, generated_at, overall summary, top_takeaways, articles and sentiment
     resp = await asyncio.to_thread(
@@ -46,11 +54,135 @@ async def summarize_news(topic: str, mode: str, results: list) -> NewsDigest:
         contents=prompt,
         config={
             "response_mime_type": "application/json",
-            "response_schema": clean_schema(NewsDigest.model_json_schema()),
+            "response_schema": REGISTRY["news"].response_schema,
         },
     )
     # validate the response
-    digest: NewsDigest = NewsDigest.model_validate_json(resp.text)
+    digest: NewsDigest = REGISTRY["news"].validate(resp.text)
     digest.topic = topic
     digest.mode = mode
     return digest
+
+
+# rough token estimate for prompt packing (~4 chars per token)
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+# output room reserved per topic: a digest with up to 8 summarized articles
+NEWS_OUTPUT_TOKENS_PER_TOPIC = 1200
+
+
+def batch_prompt(chunk: List[Tuple[str, str]], mode: str) -> str:
+    sections = "\n\n".join(
+        f"### Topic {i}: {topic}\n{block}" for i, (topic, block) in enumerate(chunk, 1)
+    )
+    return f"You are a precise news analyst.\nReturn one digest per topic below, in the same order, with topic set exactly as given.\nMode: {mode} -> {NEWS_MODES.get(mode, 'briefing')}\nRules (per topic): {NEWS_RULES} Only use each topic's own web results.\n\n{sections}"
+
+
+# packs topics into chunks that fit the token budget (instructions, each topic's
+# results and its output allowance) and hold at most max_topics topics
+# a single oversized topic still gets a chunk of its own
+def pack_topics(
+    items: List[Tuple[str, list]], mode: str, token_budget: int, max_topics: int
+) -> List[List[Tuple[str, str]]]:
+    overhead = estimate_tokens(batch_prompt([], mode))
+    chunks: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    used = overhead
+    for topic, results in items:
+        block = format_results(results)
+        cost = estimate_tokens(f"### Topic {len(current) + 1}: {topic}\n{block}")
+        cost += NEWS_OUTPUT_TOKENS_PER_TOPIC
+        if current and (used + cost > token_budget or len(current) >= max_topics):
+            chunks.append(current)
+            current, used = [], overhead
+        current.append((topic, block))
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# pairs returned digests with the requested topics by name (case-insensitive),
+# one digest per topic; never by position, since a renamed and reordered
+# response would silently swap digests. raises when a topic is left without
+# a digest so callers can fall back
+def match_digests(topics: List[str], digests: List[NewsDigest]) -> List[NewsDigest]:
+    keys = [d.topic.strip().casefold() for d in digests]
+    used: set = set()
+    matched: List[Optional[NewsDigest]] = []
+    for topic in topics:
+        key = topic.strip().casefold()
+        i = next((j for j, k in enumerate(keys) if k == key and j not in used), None)
+        if i is not None:
+            used.add(i)
+        matched.append(digests[i] if i is not None else None)
+    missing = [t for t, d in zip(topics, matched) if d is None]
+    if missing:
+        raise ValueError(f"batch digest missing topics: {', '.join(missing)}")
+    return matched
+
+
+# several topics' digests in one structured-output call
+# raises if the response is invalid or misses a topic so callers can fall back
+async def summarize_news_chunk(
+    chunk: List[Tuple[str, str]], mode: str
+) -> List[NewsDigest]:
+    compiled = REGISTRY["news_batch"]
+    resp = await asyncio.to_thread(
+        genai_client.models.generate_content,
+        model=config.gemini_model,
+        contents=batch_prompt(chunk, mode),
+        config={
+            "response_mime_type": "application/json",
+            "response_schema": compiled.response_schema,
+        },
+    )
+    digests = compiled.validate(resp.text).digests
+    out = match_digests([topic for topic, _ in chunk], digests)
+    for (topic, _), d in zip(chunk, out):
+        d.topic = topic
+        d.mode = mode
+    return out
+
+
+# digests for many topics with as few Gemini calls as the budget allows
+# a chunk that fails validation is retried topic by topic; a topic that still
+# fails is logged and left out
+async def summarize_news_batch(
+    items: List[Tuple[str, list]], mode: str, token_budget: int, max_topics: int
+) -> List[NewsDigest]:
+    results = dict(items)
+
+    async def run_chunk(chunk: List[Tuple[str, str]]) -> List[NewsDigest]:
+        if len(chunk) > 1:
+            try:
+                digests = await summarize_news_chunk(chunk, mode)
+                log.info("news batch of %d topics ok", len(chunk))
+                return digests
+            except Exception as e:
+                log.warning(
+                    "news batch of %d topics failed, falling back per topic: %s",
+                    len(chunk),
+                    e,
+                )
+        singles = await asyncio.gather(
+            *(summarize_news(t, mode, results[t]) for t, _ in chunk),
+            return_exceptions=True,
+        )
+        out = []
+        for (topic, _), d in zip(chunk, singles):
+            if isinstance(d, Exception):
+                # one bad topic shouldn't sink the rest of the request
+                log.warning("news digest failed for %r, dropping it: %s", topic, d)
+                continue
+            out.append(d)
+        return out
+
+    chunks = pack_topics(items, mode, token_budget, max_topics)
+    done = await asyncio.gather(*(run_chunk(c) for c in chunks))
+    digests = [d for chunk_digests in done for d in chunk_digests]
+    if items and not digests:
+        raise ValueError("News digests failed for every topic")
+    return digests
@@ -0,0 +1,66 @@
+from typing import Any, Dict, List
+import asyncio
+import hashlib
+from .prompts import REGISTRY
+from .clients import genai_client, exa_client
+from ..config import config
+
+# source pages behind each snapshot section (overridable via POLICY_SOURCES_MY/SG)
+POLICY_SOURCES: Dict[str, List[str]] = {
+    "my": config.policy_sources_my,
+    "sg": config.policy_sources_sg,
+}
+
+POLICY_FOCUS: Dict[str, str] = {
+    "my": "Malaysia net energy metering: remaining NEM Rakyat, NEM GoMEn and NOVA quotas in MW, the offset basis, the current rebate (RM per kWac, cap, start date), and links to the quota dashboard, about page and payment page",
+    "sg": "Singapore solar export schemes: whether a quota applies, each scheme id with its audience and payout basis, and links to the about and payment pages",
+}
+
+
+# fetches page text for a section's sources via Exa (one call per section)
+async def fetch_policy_pages(urls: List[str]) -> List[Dict[str, str]]:
+    if not urls:
+        return []
+    try:
+        resp = await asyncio.to_thread(exa_client.get_contents, urls, text=True)
+    except Exception:
+        return []
+    pages = [
+        {"url": getattr(r, "url", "") or "", "text": getattr(r, "text", "") or ""}
+        for r in getattr(resp, "results", []) or []
+    ]
+    # stable order so the hash only moves when the text does
+    return sorted((p for p in pages if p["text"]), key=lambda p: p["url"])
+
+
+# content hash over a section's pages
+def hash_pages(pages: List[Dict[str, str]]) -> str:
+    h = hashlib.sha256()
+    for p in pages:
+        h.update(p["url"].encode("utf-8"))
+        h.update(b"\0")
+        h.update(p["text"].encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+# structures one section's pages into its policy schema via Gemini
+async def extract_policy(section: str, pages: List[Dict[str, str]]) -> Any:
+    compiled = REGISTRY[f"policy_{section}"]
+    content = "\n---\n".join(f"URL: {p['url']}\n{p['text'][:6000]}" for p in pages)
+    prompt = (
+        "Extract the current policy figures from the official pages below and return JSON matching the schema.\n"
+        f"Focus: {POLICY_FOCUS[section]}\n"
+        "Use null when a figure is not stated. Do not invent numbers; prefer the most recent figure when pages disagree.\n\n"
+        f"Pages:\n{content}"
+    )
+    resp = await asyncio.to_thread(
+        genai_client.models.generate_content,
+        model=config.gemini_model,
+        contents=prompt,
+        config={
+            "response_mime_type": "application/json",
+            "response_schema": compiled.response_schema,
+        },
+    )
+    return compiled.validate(resp.text)
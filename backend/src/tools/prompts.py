@@ -0,0 +1,87 @@
+from typing import Any, Callable, Dict, Type
+import copy
+from functools import lru_cache
+from pydantic import BaseModel
+from ..schemas import (
+    CompanyProfile,
+    PersonProfile,
+    LinkedinSchema,
+    NewsDigest,
+    NewsDigestBatch,
+    PolicyMY,
+    PolicySG,
+)
+from .utils import clean_schema
+
+
+# everything an LLM structured-output call needs for one target, built once
+class CompiledSchema:
+    def __init__(self, model: Type[BaseModel]):
+        json_schema = model.model_json_schema()
+        self.model = model
+        self._response_schema: Dict[str, Any] = clean_schema(json_schema)
+        # short field list for the prompt text instead of the full JSON dump
+        self.prompt_schema: str = _field_list(json_schema)
+        self.validate: Callable[[str], Any] = model.model_validate_json
+
+    # sent as response_schema; a fresh copy per call because google-genai
+    # rewrites dict schemas in place ($defs inlined, property ordering added),
+    # which races when concurrent calls share one cached dict
+    @property
+    def response_schema(self) -> Dict[str, Any]:
+        return copy.deepcopy(self._response_schema)
+
+
+# compiles a target once; later calls return the cached artifacts
+@lru_cache(maxsize=None)
+def compile_schema(model: Type[BaseModel]) -> CompiledSchema:
+    return CompiledSchema(model)
+
+
+# compact type label for a JSON schema node, e.g. "str?", "list[str]", "{name, title}"
+def _type_label(node: Dict[str, Any], defs: Dict[str, Any]) -> str:
+    if "$ref" in node:
+        ref = defs.get(node["$ref"].split("/")[-1], {})
+        return "{" + ", ".join(ref.get("properties", {})) + "}"
+    if "anyOf" in node:
+        opts = [o for o in node["anyOf"] if o.get("type") != "null"]
+        label = " | ".join(_type_label(o, defs) for o in opts) or "null"
+        return f"{label}?" if len(opts) < len(node["anyOf"]) else label
+    t = node.get("type")
+    if t == "array":
+        return f"list[{_type_label(node.get('items', {}), defs)}]"
+    if node.get("format") == "uri":
+        return "url"
+    if node.get("format") == "date-time":
+        return "datetime"
+    return {
+        "string": "str",
+        "integer": "int",
+        "number": "float",
+        "boolean": "bool",
+    }.get(t, t or "any")
+
+
+def _field_list(json_schema: Dict[str, Any]) -> str:
+    defs = json_schema.get("$defs", {})
+    lines = []
+    for name, node in json_schema.get("properties", {}).items():
+        line = f"- {name}: {_type_label(node, defs)}"
+        if "minimum" in node and "maximum" in node:
+            line += f" {node['minimum']}-{node['maximum']}"
+        if node.get("description"):
+            line += f" ({node['description']})"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+# known targets are compiled on import so no request pays for it
+REGISTRY: Dict[str, CompiledSchema] = {
+    "company": compile_schema(CompanyProfile),
+    "person": compile_schema(PersonProfile),
+    "linkedin": compile_schema(LinkedinSchema),
+    "news": compile_schema(NewsDigest),
+    "news_batch": compile_schema(NewsDigestBatch),
+    "policy_my": compile_schema(PolicyMY),
+    "policy_sg": compile_schema(PolicySG),
+}
@@ -0,0 +1,156 @@
+from typing import Any, Dict, List, Optional, Tuple
+import random
+import re
+
+PROVIDERS = ("exa", "tavily")
+
+CATEGORY_PATTERNS: List[Tuple[str, re.Pattern]] = [
+    ("news", re.compile(r"\b(news|latest|headlines|updates|past \d+ days)\b", re.I)),
+    ("funding", re.compile(r"\b(funding|revenue|raised|valuation|investors?)\b", re.I)),
+    (
+        "people",
+        re.compile(
+            r"\b(leadership|executives?|ceo|founders?|speaking|education|experience|skills|resume|posts|role)\b",
+            re.I,
+        ),
+    ),
+]
+
+
+# overview | news | people | funding
+def classify_query(query: str) -> str:
+    for category, pattern in CATEGORY_PATTERNS:
+        if pattern.search(query):
+            return category
+    return "overview"
+
+
+# moving averages for one provider in one category
+class ProviderStats:
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.calls = 0
+        self.paired = 0
+        self.latency_ms = 0.0
+        self.error_rate = 0.0
+        # results returned per requested result
+        self.yield_ratio = 0.0
+        # results the other provider did not return, per requested result
+        self.gain_ratio = 0.0
+
+    def _ewma(self, old: float, new: float, n: int) -> float:
+        return new if n == 1 else old + self.alpha * (new - old)
+
+    def record(self, latency_ms: float, ok: bool, found: int, wanted: int) -> None:
+        self.calls += 1
+        self.latency_ms = self._ewma(self.latency_ms, latency_ms, self.calls)
+        self.error_rate = self._ewma(self.error_rate, 0.0 if ok else 1.0, self.calls)
+        self.yield_ratio = self._ewma(
+            self.yield_ratio, found / max(1, wanted), self.calls
+        )
+
+    def record_gain(self, unique: int, wanted: int) -> None:
+        self.paired += 1
+        self.gain_ratio = self._ewma(
+            self.gain_ratio, unique / max(1, wanted), self.paired
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "paired": self.paired,
+            "latency_ms": round(self.latency_ms, 1),
+            "error_rate": round(self.error_rate, 3),
+            "yield_ratio": round(self.yield_ratio, 3),
+            "gain_ratio": round(self.gain_ratio, 3),
+        }
+
+
+# picks the provider mix per query from observed latency, errors and unique yield
+# a provider is skipped only when, alongside the other, it has been adding little
+# (low gain) while the other is healthy and returns enough results on its own
+class SearchRouter:
+    def __init__(
+        self,
+        explore_rate: float = 0.1,
+        min_samples: int = 5,
+        min_yield: float = 0.8,
+        min_gain: float = 0.3,
+        max_error_rate: float = 0.2,
+        alpha: float = 0.2,
+    ):
+        self.explore_rate = explore_rate
+        self.min_samples = min_samples
+        self.min_yield = min_yield
+        self.min_gain = min_gain
+        self.max_error_rate = max_error_rate
+        self.alpha = alpha
+        self.stats: Dict[str, Dict[str, ProviderStats]] = {}
+        self.decisions: Dict[str, int] = {}
+
+    def _bucket(self, category: str) -> Dict[str, ProviderStats]:
+        if category not in self.stats:
+            self.stats[category] = {p: ProviderStats(self.alpha) for p in PROVIDERS}
+        return self.stats[category]
+
+    # category stats once they have enough paired samples, else overall ("*")
+    def _evidence(self, category: str) -> Optional[Dict[str, ProviderStats]]:
+        for key in (category, "*"):
+            bucket = self._bucket(key)
+            if all(s.paired >= self.min_samples for s in bucket.values()):
+                return bucket
+        return None
+
+    def choose(self, category: str, force_both: bool = False) -> Tuple[str, ...]:
+        picked = self._choose(category, force_both)
+        label = "+".join(picked)
+        self.decisions[label] = self.decisions.get(label, 0) + 1
+        return picked
+
+    def _choose(self, category: str, force_both: bool) -> Tuple[str, ...]:
+        if force_both or random.random() < self.explore_rate:
+            return PROVIDERS
+        bucket = self._evidence(category)
+        if bucket is None:
+            return PROVIDERS
+        viable = []
+        for p in PROVIDERS:
+            other = next(o for o in PROVIDERS if o != p)
+            s, o = bucket[p], bucket[other]
+            if (
+                s.error_rate <= self.max_error_rate
+                and s.yield_ratio >= self.min_yield
+                and o.gain_ratio < self.min_gain
+            ):
+                viable.append((s.latency_ms, p))
+        if not viable:
+            return PROVIDERS
+        return (min(viable)[1],)
+
+    def record(
+        self,
+        category: str,
+        provider: str,
+        latency_ms: float,
+        ok: bool,
+        found: int,
+        wanted: int,
+    ) -> None:
+        for key in (category, "*"):
+            self._bucket(key)[provider].record(latency_ms, ok, found, wanted)
+
+    # only measurable when both providers ran on the same query
+    def record_gain(
+        self, category: str, provider: str, unique: int, wanted: int
+    ) -> None:
+        for key in (category, "*"):
+            self._bucket(key)[provider].record_gain(unique, wanted)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "decisions": dict(self.decisions),
+            "stats": {
+                c: {p: s.snapshot() for p, s in bucket.items()}
+                for c, bucket in self.stats.items()
+            },
+        }
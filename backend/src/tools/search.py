@@ -1,68 +1,116 @@
 from typing import List, Dict, Any
 import asyncio
+import time
 from .clients import exa_client, tavily_client
+from .routing import PROVIDERS, SearchRouter, classify_query
+from ..config import config
+
+search_router = SearchRouter(
+    explore_rate=config.search_explore_rate,
+    min_samples=config.search_route_min_samples,
+)
 
 
 # unified web search across Exa + Tavily with de-duplication
-# get results from Exa and Tavily and return a list of dictionaries with the url, title, and content
-async def search_web(query: str, max_results: int = 5) -> List[Dict[str, Any]]:
-    exa_task = asyncio.create_task(search_exa(query, max_results))
-    tavily_task = asyncio.create_task(search_tavily(query, max_results))
-    exa_results, tavily_results = await asyncio.gather(exa_task, tavily_task)
+# get results from Exa and/or Tavily and return a list of dictionaries with the url, title, and content
+# the router picks the providers per query category; force_both skips it
+async def search_web(
+    query: str, max_results: int = 5, force_both: bool = False
+) -> List[Dict[str, Any]]:
+    category = classify_query(query)
+    providers = search_router.choose(
+        category, force_both=force_both or not config.search_adaptive_routing
+    )
+    runs = dict(
+        zip(
+            providers,
+            await asyncio.gather(
+                *(run_provider(p, category, query, max_results) for p in providers)
+            ),
+        )
+    )
+    if len(providers) == 1 and not runs[providers[0]]:
+        # the routed provider came back empty; don't let routing cost results
+        other = next(p for p in PROVIDERS if p != providers[0])
+        runs[other] = await run_provider(other, category, query, max_results)
+    if len(runs) == 2:
+        urls = {
+            p: {r.get("url") for r in rows if r.get("url")} for p, rows in runs.items()
+        }
+        for p, other in (PROVIDERS, PROVIDERS[::-1]):
+            search_router.record_gain(
+                category, p, len(urls[p] - urls[other]), max_results
+            )
     seen, out = set(), []
-    for r in exa_results + tavily_results:
-        u = r.get("url")
-        # de-duplicate
-        if u and u not in seen:
-            seen.add(u)
-            out.append(r)
+    for p in PROVIDERS:
+        for r in runs.get(p, []):
+            u = r.get("url")
+            # de-duplicate
+            if u and u not in seen:
+                seen.add(u)
+                out.append(r)
     return out[: max_results * 2]
 
 
+# times one provider call and feeds the router
+async def run_provider(
+    provider: str, category: str, query: str, max_results: int
+) -> List[Dict[str, Any]]:
+    fetch = fetch_exa if provider == "exa" else fetch_tavily
+    t0 = time.perf_counter()
+    try:
+        rows, ok = await fetch(query, max_results), True
+    except Exception:
+        rows, ok = [], False
+    search_router.record(
+        category,
+        provider,
+        latency_ms=(time.perf_counter() - t0) * 1000,
+        ok=ok,
+        found=len({r.get("url") for r in rows if r.get("url")}),
+        wanted=max_results,
+    )
+    return rows
+
+
 # both wrappers return a list of dictionaries with the url, title, and content
-# using both clients to get richer results
+# they raise on provider errors; run_provider catches and counts them
 
 
 # Exa wrapper
-async def search_exa(query: str, max_results: int) -> List[Dict[str, Any]]:
-    try:
-        resp = await asyncio.to_thread(
-            exa_client.search_and_contents,
-            query,
-            use_autoprompt=True,
-            num_results=max_results,
-            type="auto",
-        )
-        return [
-            {
-                "url": getattr(r, "url", ""),
-                "title": getattr(r, "title", ""),
-                "content": getattr(r, "text", "")[:1000],
-            }
-            for r in getattr(resp, "results", [])
-        ]
-    except Exception:
-        return []
+async def fetch_exa(query: str, max_results: int) -> List[Dict[str, Any]]:
+    resp = await asyncio.to_thread(
+        exa_client.search_and_contents,
+        query,
+        use_autoprompt=True,
+        num_results=max_results,
+        type="auto",
+    )
+    return [
+        {
+            "url": getattr(r, "url", ""),
+            "title": getattr(r, "title", ""),
+            "content": getattr(r, "text", "")[:1000],
+        }
+        for r in getattr(resp, "results", [])
+    ]
 
 
 # Tavily wrapper
-async def search_tavily(query: str, max_results: int) -> List[Dict[str, Any]]:
-    try:
-        resp = await asyncio.to_thread(
-            tavily_client.search,
-            query,
-            max_results=max_results,
-            include_answer=False,
-            auto_parameters=True,
-        )
-        results = resp.get("results", [])
-        return [
-            {
-                "url": r.get("url", ""),
-                "title": r.get("title", ""),
-                "content": (r.get("content", "") or "")[:1000],
-            }
-            for r in results
-        ]
-    except Exception:
-        return []
+async def fetch_tavily(query: str, max_results: int) -> List[Dict[str, Any]]:
+    resp = await asyncio.to_thread(
+        tavily_client.search,
+        query,
+        max_results=max_results,
+        include_answer=False,
+        auto_parameters=True,
+    )
+    results = resp.get("results", [])
+    return [
+        {
+            "url": r.get("url", ""),
+            "title": r.get("title", ""),
+            "content": (r.get("content", "") or "")[:1000],
+        }
+        for r in results
+    ]
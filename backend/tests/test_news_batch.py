@@ -0,0 +1,117 @@
+import asyncio
+import json
+import pytest
+from src.schemas import NewsDigest
+from src.tools import llm
+
+
+def rows(topic, n=2, size=400):
+    return [
+        {
+            "url": f"https://example.com/{topic}/{i}",
+            "title": topic,
+            "content": "x" * size,
+        }
+        for i in range(n)
+    ]
+
+
+def test_pack_topics_caps_topics_per_chunk():
+    items = [(f"t{i}", rows(f"t{i}", size=10)) for i in range(7)]
+    chunks = llm.pack_topics(items, "briefing", token_budget=10**6, max_topics=3)
+    assert [len(c) for c in chunks] == [3, 3, 1]
+    assert [t for c in chunks for t, _ in c] == [t for t, _ in items]
+
+
+def test_pack_topics_reserves_output_tokens():
+    items = [(f"t{i}", rows(f"t{i}", size=10)) for i in range(4)]
+    budget = 2 * llm.NEWS_OUTPUT_TOKENS_PER_TOPIC + 400
+    chunks = llm.pack_topics(items, "briefing", token_budget=budget, max_topics=10)
+    assert [len(c) for c in chunks] == [2, 2]
+
+
+def test_pack_topics_oversized_topic_gets_own_chunk():
+    items = [("big", rows("big", n=10, size=800)), ("small", rows("small", size=10))]
+    chunks = llm.pack_topics(items, "briefing", token_budget=100, max_topics=5)
+    assert [[t for t, _ in c] for c in chunks] == [["big"], ["small"]]
+
+
+def test_match_digests_by_name_case_insensitive():
+    digests = [NewsDigest(topic="ai"), NewsDigest(topic="Solar")]
+    out = llm.match_digests(["SOLAR", "AI"], digests)
+    assert out == [digests[1], digests[0]]
+
+
+def test_match_digests_never_pairs_by_position():
+    digests = [NewsDigest(topic="one"), NewsDigest(topic="two")]
+    with pytest.raises(ValueError):
+        llm.match_digests(["A", "B"], digests)
+
+
+def test_match_digests_partial_name_match_raises():
+    digests = [NewsDigest(topic="B"), NewsDigest(topic="A rephrased")]
+    with pytest.raises(ValueError, match="A"):
+        llm.match_digests(["A", "B"], digests)
+
+
+def test_match_digests_never_shares_a_digest():
+    digests = [NewsDigest(topic="ai"), NewsDigest(topic="other")]
+    with pytest.raises(ValueError):
+        llm.match_digests(["AI", "ai"], digests)
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+def test_batch_falls_back_per_topic_on_partial_match(monkeypatch):
+    calls = []
+
+    def generate_content(model, contents, config):
+        if "### Topic" in contents:
+            calls.append("batch")
+            return FakeResponse(
+                json.dumps({"digests": [{"topic": "B"}, {"topic": "A rephrased"}]})
+            )
+        calls.append("single")
+        return FakeResponse(json.dumps({"topic": "whatever"}))
+
+    monkeypatch.setattr(llm.genai_client.models, "generate_content", generate_content)
+    items = [("A", rows("A")), ("B", rows("B"))]
+    out = asyncio.run(
+        llm.summarize_news_batch(items, "briefing", token_budget=10**6, max_topics=5)
+    )
+    assert calls == ["batch", "single", "single"]
+    assert [d.topic for d in out] == ["A", "B"]
+    assert out[0] is not out[1]
+
+
+def test_batch_drops_a_topic_whose_single_call_fails(monkeypatch):
+    def generate_content(model, contents, config):
+        if "### Topic" in contents:
+            return FakeResponse("not json")
+        if "Topic: B" in contents:
+            raise RuntimeError("gemini down")
+        return FakeResponse(json.dumps({"topic": "whatever"}))
+
+    monkeypatch.setattr(llm.genai_client.models, "generate_content", generate_content)
+    items = [("A", rows("A")), ("B", rows("B")), ("C", rows("C"))]
+    out = asyncio.run(
+        llm.summarize_news_batch(items, "briefing", token_budget=10**6, max_topics=5)
+    )
+    assert [d.topic for d in out] == ["A", "C"]
+
+
+def test_batch_raises_when_every_topic_fails(monkeypatch):
+    def generate_content(model, contents, config):
+        raise RuntimeError("gemini down")
+
+    monkeypatch.setattr(llm.genai_client.models, "generate_content", generate_content)
+    items = [("A", rows("A")), ("B", rows("B"))]
+    with pytest.raises(ValueError):
+        asyncio.run(
+            llm.summarize_news_batch(
+                items, "briefing", token_budget=10**6, max_topics=5
+            )
+        )
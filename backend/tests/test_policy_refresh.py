@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+from src.schemas import PolicyMY, PolicySG
+from src.services import policy_service as ps
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    s = ps.PolicyStore(str(tmp_path / "policy.json"), history_limit=5)
+    monkeypatch.setattr(ps, "store", s)
+    monkeypatch.setattr(
+        ps, "POLICY_SOURCES", {"my": ["https://my"], "sg": ["https://sg"]}
+    )
+    return s
+
+
+def stub_sources(monkeypatch, failing):
+    calls = []
+
+    async def fetch(urls):
+        return [{"url": urls[0], "text": "page"}]
+
+    async def extract(section, pages):
+        calls.append(section)
+        if section in failing:
+            raise ValueError("gemini down")
+        return PolicyMY(rakyat_quota_mw=1.0) if section == "my" else PolicySG()
+
+    monkeypatch.setattr(ps, "fetch_policy_pages", fetch)
+    monkeypatch.setattr(ps, "extract_policy", extract)
+    return calls
+
+
+def test_cold_start_keeps_extracted_sections_between_attempts(store, monkeypatch):
+    failing = {"sg"}
+    calls = stub_sources(monkeypatch, failing)
+
+    assert asyncio.run(ps.refresh_policy()) is None
+    assert not store.last_ok
+    assert set(store.pending) == {"my"}
+
+    failing.clear()
+    snapshot = asyncio.run(ps.refresh_policy())
+    assert snapshot is not None and snapshot.my.rakyat_quota_mw == 1.0
+    assert store.last_ok
+    assert store.pending == {}
+    # "my" was not re-extracted on the retry
+    assert calls == ["my", "sg", "sg"]
+
+
+def test_unchanged_sources_skip_extraction(store, monkeypatch):
+    calls = stub_sources(monkeypatch, failing=set())
+    asyncio.run(ps.refresh_policy())
+    asyncio.run(ps.refresh_policy())
+    assert sorted(calls) == ["my", "sg"]
+    assert store.last_ok
+
+
+def test_next_refresh_delay_backs_off_to_interval():
+    delays = [ps.next_refresh_delay(n, 3600, 30) for n in range(8)]
+    assert delays == [3600, 30, 60, 120, 240, 480, 960, 1920]
+    assert ps.next_refresh_delay(20, 3600, 30) == 3600
@@ -0,0 +1,20 @@
+import copy
+from google.genai import _transformers, types
+from src.tools.prompts import REGISTRY
+
+
+# google-genai rewrites dict schemas in place on the request path; every call
+# must get its own copy so the cached schema never changes under concurrent calls
+def test_registry_schemas_survive_the_sdk_request_path():
+    for name, compiled in REGISTRY.items():
+        before = copy.deepcopy(compiled._response_schema)
+        sent = compiled.response_schema
+        schema = _transformers.t_schema(None, sent)
+        assert isinstance(schema, types.Schema), name
+        assert compiled._response_schema == before, name
+        assert compiled.response_schema is not compiled.response_schema
+
+
+def test_registry_covers_every_target():
+    assert set(REGISTRY) >= {"company", "person", "linkedin", "news", "news_batch"}
+    assert "- skills: list[str]" in REGISTRY["linkedin"].prompt_schema
@@ -0,0 +1,41 @@
+import asyncio
+from src.schemas import CompanyProfile, NewsDigest
+from src.services import research_service as rs
+
+
+def stub(monkeypatch, linkedin):
+    async def extract(url):
+        return linkedin
+
+    async def search(query, max_results=5):
+        return [{"url": f"https://example.com/{query}", "title": query, "content": ""}]
+
+    async def analyze(content, target, name, schema):
+        return CompanyProfile(name=name, description="d")
+
+    async def summarize(topic, mode, results):
+        return NewsDigest(topic=topic)
+
+    monkeypatch.setattr(rs, "extract_linkedin_data", extract)
+    monkeypatch.setattr(rs, "search_web", search)
+    monkeypatch.setattr(rs, "analyze_content", analyze)
+    monkeypatch.setattr(rs, "summarize_news", summarize)
+
+
+def test_linkedin_error_reported_once_under_person(monkeypatch):
+    stub(monkeypatch, {"error": "Exa fetch failed"})
+    out = asyncio.run(
+        rs.research(linkedin_url="https://linkedin.com/in/x", company="DBS")
+    )
+    assert out.errors == {"person": "Exa fetch failed"}
+    assert out.person is None and out.company.name == "DBS"
+
+
+def test_linkedin_error_reported_when_person_not_requested(monkeypatch):
+    stub(monkeypatch, {"error": "Exa fetch failed"})
+    out = asyncio.run(
+        rs.research(linkedin_url="https://linkedin.com/in/x", sections=["company"])
+    )
+    assert out.errors["linkedin"] == "Exa fetch failed"
+    assert "person" not in out.errors
+    assert "company" in out.errors
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from src.tools import search
+from src.tools.routing import SearchRouter
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    state = {"calls": [], "exa_empty": False}
+
+    # exa finds 5 results; tavily finds 3 of the same, so it adds nothing
+    async def fetch_exa(query, max_results):
+        state["calls"].append("exa")
+        if state["exa_empty"]:
+            return []
+        return [{"url": f"https://example.com/{i}"} for i in range(max_results)]
+
+    async def fetch_tavily(query, max_results):
+        state["calls"].append("tavily")
+        return [{"url": f"https://example.com/{i}"} for i in range(3)]
+
+    router = SearchRouter(explore_rate=0.0, min_samples=3)
+    monkeypatch.setattr(search, "search_router", router)
+    monkeypatch.setattr(search, "fetch_exa", fetch_exa)
+    monkeypatch.setattr(search, "fetch_tavily", fetch_tavily)
+    monkeypatch.setattr(search.config, "search_adaptive_routing", True)
+    return state
+
+
+def run(query, **kwargs):
+    return asyncio.run(search.search_web(query, max_results=5, **kwargs))
+
+
+def train(state, n=3):
+    for _ in range(n):
+        run("acme company overview")
+    state["calls"].clear()
+
+
+def test_both_providers_until_enough_samples(providers):
+    run("acme company overview")
+    run("acme company overview")
+    assert providers["calls"] == ["exa", "tavily", "exa", "tavily"]
+
+
+def test_routes_to_one_provider_once_other_gain_is_low(providers):
+    train(providers)
+    assert len(run("acme company overview")) == 5
+    assert providers["calls"] == ["exa"]
+
+
+def test_unseen_category_falls_back_to_overall_stats(providers):
+    train(providers)
+    run("acme funding revenue")
+    assert providers["calls"] == ["exa"]
+
+
+def test_force_both_and_disabled_routing_query_both(providers, monkeypatch):
+    train(providers)
+    run("acme company overview", force_both=True)
+    assert providers["calls"] == ["exa", "tavily"]
+    providers["calls"].clear()
+    monkeypatch.setattr(search.config, "search_adaptive_routing", False)
+    run("acme company overview")
+    assert providers["calls"] == ["exa", "tavily"]
+
+
+def test_empty_single_provider_result_queries_the_other(providers):
+    train(providers)
+    providers["exa_empty"] = True
+    out = run("acme company overview")
+    assert providers["calls"] == ["exa", "tavily"]
+    assert len(out) == 3